@@ -1,4 +1,6 @@
 import zmq
+import zmq.asyncio
+import asyncio
 import pandas as pd
 import numpy as np
 import time
@@ -7,75 +9,351 @@ import threading
 import os
 import csv
 import argparse
+import atexit
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-# --- Data Packing/Unpacking Functions ---
+try:
+    import uvloop
+except ImportError: # uvloop is unavailable on Windows
+    uvloop = None
 
-def pack_sensor_data(row):
-    """Packs a row of sensor data into a binary format."""
-    return struct.pack('<iqfffffff',
-                     int(row['sensor_id']),
-                     int(row['time']),
-                     row['x'], row['y'], row['z'],
-                     row['qw'], row['qx'], row['qy'], row['qz'])
+# --- Data Packing/Unpacking Functions ---
 
-def unpack_sensor_data(message_bytes):
+# Compiled once so the format string is not re-parsed for every message.
+_SENSOR_STRUCT = struct.Struct('<iqfffffff')
+
+# Wire layout of a single sensor sample; matches _SENSOR_STRUCT. Sensor data is
+# kept in arrays of this dtype from loading through sending and decoding.
+SENSOR_DTYPE = np.dtype([
+    ('sensor_id', '<i4'), ('time', '<i8'),
+    ('x', '<f4'), ('y', '<f4'), ('z', '<f4'),
+    ('qw', '<f4'), ('qx', '<f4'), ('qy', '<f4'), ('qz', '<f4')
+], align=False)
+
+# Quantized wire layout: positions in millimeters and quaternion components
+# in Q15 fixed point, stored as int16. Positions are limited to +-32.767 m.
+QUANTIZED_SENSOR_DTYPE = np.dtype([
+    ('sensor_id', '<i4'), ('time', '<i8'), ('pose', '<i2', (7,))
+], align=False)
+
+# Value of one quantized step for x, y, z, qw, qx, qy, qz.
+QUANTIZATION_SCALES = np.array([1e-3] * 3 + [1 / 32767] * 4, dtype=np.float32)
+# Quantized value standing for a non-finite (NaN or infinite) pose component,
+# e.g. while a sensor is out of range. It is decoded as NaN. Finite values
+# are clipped to +-32767, so they never collide with it.
+QUANTIZED_NAN = -32768
+
+# Alternative view of SENSOR_DTYPE exposing the seven floats as one (7,) field.
+_SENSOR_POSE_DTYPE = np.dtype({
+    'names': ['sensor_id', 'time', 'pose'],
+    'formats': ['<i4', '<i8', ('<f4', (7,))],
+    'offsets': [0, 4, 12],
+    'itemsize': SENSOR_DTYPE.itemsize
+})
+
+def pack_sensor_data(row, quantize=False):
+    """
+    Packs a row of sensor data into a binary format.
+    With quantize, the pose is packed as int16 (see QUANTIZED_SENSOR_DTYPE).
+    """
+    pose = [row['x'], row['y'], row['z'], row['qw'], row['qx'], row['qy'], row['qz']]
+    if quantize:
+        # Shares quantize_sensor_table's rounding and clipping.
+        sample = np.array([(int(row['sensor_id']), int(row['time']), *pose)], dtype=SENSOR_DTYPE)
+        return quantize_sensor_table(sample).tobytes()
+    return _SENSOR_STRUCT.pack(int(row['sensor_id']),
+                               int(row['time']),
+                               *pose)
+
+def unpack_sensor_data(message_bytes, quantized=False):
     """Unpacks a binary message into a tuple of sensor data."""
-    return struct.unpack('<iqfffffff', message_bytes)
+    if quantized:
+        # Shares dequantize_sensor_table's scaling, so both decoders agree.
+        sample = np.frombuffer(message_bytes, dtype=QUANTIZED_SENSOR_DTYPE)
+        return dequantize_sensor_table(sample).tolist()[0]
+    return _SENSOR_STRUCT.unpack(message_bytes)
+
+def quantize_sensor_table(table):
+    """
+    Converts a SENSOR_DTYPE array to QUANTIZED_SENSOR_DTYPE, clipping out-of-range
+    values and mapping non-finite ones to QUANTIZED_NAN.
+    """
+    quantized = np.empty(len(table), dtype=QUANTIZED_SENSOR_DTYPE)
+    quantized['sensor_id'] = table['sensor_id']
+    quantized['time'] = table['time']
+    pose = table.view(_SENSOR_POSE_DTYPE)['pose']
+    finite = np.isfinite(pose)
+    steps = np.clip(np.round(np.where(finite, pose, 0) / QUANTIZATION_SCALES), -32767, 32767)
+    quantized['pose'] = np.where(finite, steps, QUANTIZED_NAN)
+    return quantized
+
+def dequantize_sensor_table(quantized):
+    """Converts a QUANTIZED_SENSOR_DTYPE array back to SENSOR_DTYPE."""
+    table = np.empty(len(quantized), dtype=SENSOR_DTYPE)
+    view = table.view(_SENSOR_POSE_DTYPE)
+    view['sensor_id'] = quantized['sensor_id']
+    view['time'] = quantized['time']
+    pose = quantized['pose']
+    view['pose'] = np.where(pose == QUANTIZED_NAN, np.nan, pose * QUANTIZATION_SCALES)
+    return table
+
+def format_sensor_data(topic, data):
+    """Formats unpacked sensor data (a tuple or SENSOR_DTYPE record) for display."""
+    return (f"CONSUMER: Received on '{topic}': "
+            f"ID={data[0]}, Time={data[1]}, "
+            f"Pos=({data[2]:.2f}, {data[3]:.2f}, {data[4]:.2f}), "
+            f"Quat=({data[5]:.2f}, {data[6]:.2f}, {data[7]:.2f}, {data[8]:.2f})")
+
+
+# --- Data Loading Functions ---
+
+# Maps the (stripped) CSV column names to the sensor data fields.
+CSV_COLUMNS = {
+    'SEU': 'sensor_id', 'Frame': 'time',
+    'X1 (M)': 'x', 'Y1': 'y', 'Z1': 'z',
+    'Qw1': 'qw', 'Qx1': 'qx', 'Qy1': 'qy', 'Qz1': 'qz'
+}
+
+# Layout used while parsing the CSV. Sensor IDs and frames may be written as
+# floats (e.g. '1.0'); they are truncated when cast to SENSOR_DTYPE.
+_CSV_DTYPE = np.dtype([('sensor_id', '<f8'), ('time', '<f8')] + [
+    (name, SENSOR_DTYPE.fields[name][0]) for name in SENSOR_DTYPE.names[2:]
+])
+
+# Files below this size (in bytes) are parsed with NumPy instead of pandas.
+SMALL_CSV_SIZE = 1024 * 1024
+
+def _cache_path(path):
+    """Returns the path of the '.npy' cache belonging to a CSV file."""
+    return os.path.splitext(path)[0] + '.npy'
+
+def _is_cache_current(cache_path, path):
+    """Checks that a cache file exists and is not older than its source file."""
+    return os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path)
+
+# Also accepts files starting with a UTF-8 byte order mark, as written by
+# many Windows exporters.
+CSV_ENCODING = 'utf-8-sig'
+
+def _read_csv_header(path):
+    """Returns the stripped column names of a CSV file."""
+    with open(path, newline='', encoding=CSV_ENCODING) as f:
+        return [name.strip() for name in next(csv.reader(f))]
+
+def load_sensor_table(path):
+    """
+    Loads the sensor columns of a CSV file into a SENSOR_DTYPE array.
+    Prefers an up-to-date sibling '.npy' cache, and writes one after parsing
+    the CSV so that later replays can skip the parsing.
+    """
+    cache_path = _cache_path(path)
+    if _is_cache_current(cache_path, path):
+        try:
+            table = np.load(cache_path, allow_pickle=False)
+        except (OSError, ValueError): # Truncated or not an array; reparse
+            table = None
+        if table is not None and table.dtype == SENSOR_DTYPE:
+            return table
+
+    header = _read_csv_header(path)
+    if os.path.getsize(path) < SMALL_CSV_SIZE:
+        # Parse like pandas: '#' is not a comment and fields may be quoted.
+        parsed = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=1,
+                            usecols=[header.index(name) for name in CSV_COLUMNS],
+                            dtype=_CSV_DTYPE, encoding=CSV_ENCODING,
+                            comments=None, quotechar='"')
+    else:
+        # Only parse the needed columns; raw header names may carry whitespace.
+        raw_names = dict(zip(header, pd.read_csv(path, nrows=0, encoding=CSV_ENCODING).columns))
+        df = pd.read_csv(path, encoding=CSV_ENCODING,
+                         usecols=[raw_names[name] for name in CSV_COLUMNS],
+                         dtype={raw_names[name]: _CSV_DTYPE.fields[field][0]
+                                for name, field in CSV_COLUMNS.items()},
+                         engine='c')
+        df.columns = df.columns.str.strip()
+        df = df.rename(columns=CSV_COLUMNS)
+        parsed = np.empty(len(df), dtype=_CSV_DTYPE)
+        for name in _CSV_DTYPE.names:
+            parsed[name] = df[name].to_numpy()
+
+    table = parsed.astype(SENSOR_DTYPE)
+
+    try:
+        np.save(cache_path, table)
+    except OSError as e:
+        print(f"WARNING: Could not write cache '{cache_path}': {e}")
+
+    return table
+
+
+# --- ZMQ Transport Configuration ---
+
+# Shared context, so that all sockets use a single IO thread. In-process
+# ('inproc') transports also only work between sockets of the same context.
+# Its sockets are closed by their owners; the context is terminated at exit.
+_CTX = zmq.Context.instance(io_threads=1)
+atexit.register(_CTX.term)
+
+# Bind and connect endpoints for each supported transport.
+TRANSPORTS = {
+    'tcp': ('tcp://*:5555', 'tcp://localhost:5555'),
+    'ipc': ('ipc:///tmp/sensors.sock', 'ipc:///tmp/sensors.sock'),
+    'inproc': ('inproc://sensors', 'inproc://sensors'),
+}
+
+def get_endpoints(transport):
+    """
+    Returns the (bind, connect) endpoints of a transport.
+    Falls back to 'tcp' for 'ipc' on Windows, where it is unsupported.
+    """
+    if transport == 'ipc' and os.name == 'nt':
+        print("WARNING: The 'ipc' transport is unavailable on Windows; using 'tcp' instead.")
+        transport = 'tcp'
+    return TRANSPORTS[transport]
 
 
 # --- ZMQ Publisher Functions ---
 
-def replay(rel_path, loop_data=False):
+# Prefix shared by every sensor topic, followed by the sensor ID.
+SENSOR_TOPIC_PREFIX = 'sensor/em/'
+# Topic carrying several concatenated samples in a single message.
+BATCH_TOPIC = SENSOR_TOPIC_PREFIX + 'batch'
+# Counterparts of the above for quantized samples.
+QUANTIZED_TOPIC_PREFIX = 'sensor/emq/'
+QUANTIZED_BATCH_TOPIC = QUANTIZED_TOPIC_PREFIX + 'batch'
+# Samples closer together than this (in seconds) may be coalesced into one batch.
+BATCH_THRESHOLD = 0.001
+# Number of samples between progress lines when not running verbosely.
+PROGRESS_INTERVAL = 10000
+# Send-side queue and kernel buffer sizes, sized for bursty replays.
+SNDHWM = 100000
+SNDBUF = 4 * 1024 * 1024
+# Time (in ms) that queued messages may still be flushed after closing.
+LINGER = 1000
+
+def replay(rel_path, loop_data=False, batch_size=1, verbose=False, hwm=SNDHWM,
+           transport=TRANSPORTS['tcp'][0], context=_CTX, quantize=False, realtime=True):
     """
     A ZMQ PUB server that reads a CSV file and streams its content.
-    Can optionally loop the data stream. Binds to port 5555.
+    Can optionally loop the data stream. Binds to transport (port 5555 by default),
+    using the given context; 'inproc' transports need the consumer's context.
+    With batch_size > 1, up to batch_size samples spaced less than
+    BATCH_THRESHOLD apart are sent together on the batch topic.
+    Prints every message if verbose, otherwise every PROGRESS_INTERVAL samples.
+    Up to hwm messages are queued per subscriber before new ones are dropped;
+    unless realtime, sending blocks on a full queue instead.
+    With quantize, samples are sent as QUANTIZED_SENSOR_DTYPE on the
+    QUANTIZED_TOPIC_PREFIX topics instead.
+    Unless realtime, samples are sent as fast as possible, ignoring frame timing.
     """
     if not os.path.exists(rel_path):
         print(f"REPLAYER: Error - File not found at '{rel_path}'")
         return
 
-    context = zmq.Context()
-    socket = context.socket(zmq.PUB)
-    socket.bind("tcp://*:5555")
-    print(f"REPLAYER: ZMQ replayer running on port 5555, reading from '{rel_path}'...")
+    # An XPUB socket publishes like PUB, but can block on a full queue instead
+    # of dropping messages (XPUB_NODROP). Max-rate replays outpace slow
+    # subscribers, so they use that to stay lossless.
+    socket = context.socket(zmq.XPUB)
+    socket.setsockopt(zmq.XPUB_NODROP, 0 if realtime else 1)
+    # Socket options must be set before binding to apply to its connections.
+    socket.setsockopt(zmq.SNDHWM, hwm)
+    socket.setsockopt(zmq.SNDBUF, SNDBUF)
+    socket.setsockopt(zmq.LINGER, LINGER)
+    socket.setsockopt(zmq.IMMEDIATE, 1)
+    socket.bind(transport)
+    print(f"REPLAYER: ZMQ replayer running on '{transport}', reading from '{rel_path}'...")
     time.sleep(1) # Pause to allow subscribers to connect
 
-    column_mapping = {
-        'SEU': 'sensor_id', 'Frame': 'time',
-        'X1 (M)': 'x', 'Y1': 'y', 'Z1': 'z',
-        'Qw1': 'qw', 'Qx1': 'qx', 'Qy1': 'qy', 'Qz1': 'qz'
-    }
-
     try:
-        df = pd.read_csv(rel_path)
-        df.columns = df.columns.str.strip()
-        df = df.rename(columns=column_mapping)
-        df = df[list(column_mapping.values())]
-        df['sensor_id'] = df['sensor_id'].astype(int)
-
-        time_diffs = np.diff(df['time'], prepend=df['time'].iloc[0]) / 1000.0
+        table = load_sensor_table(rel_path)
+
+        time_diffs = np.diff(table['time'], prepend=table['time'][0]) / 1000.0
+        # Send times relative to the start of a pass, so that time spent sending
+        # does not accumulate as drift. Backward frame jumps (counter resets,
+        # concatenated recordings) count as no gap rather than pulling every
+        # later deadline earlier.
+        offsets = np.cumsum(np.maximum(time_diffs, 0))
+
+        topic_prefix, batch_topic_name = SENSOR_TOPIC_PREFIX, BATCH_TOPIC
+        if quantize:
+            table = quantize_sensor_table(table)
+            topic_prefix, batch_topic_name = QUANTIZED_TOPIC_PREFIX, QUANTIZED_BATCH_TOPIC
+
+        # Serialize every row once up front so the publish loop only sends bytes.
+        # Payloads are memoryview slices of the table's own memory rather than
+        # per-row bytes objects; send_multipart still copies each frame into
+        # a new zmq message.
+        raw = memoryview(table.view(np.uint8))
+        size = table.dtype.itemsize
+        # Encode each distinct topic once; rows share the cached bytes objects.
+        topic_cache = {i: f"{topic_prefix}{i}".encode('utf-8')
+                       for i in np.unique(table['sensor_id']).tolist()}
+        batch_topic = batch_topic_name.encode('utf-8')
+
+        # Group the rows into messages once, as (first row, sample count, frames).
+        # Outside realtime mode, batches are filled regardless of sample spacing.
+        sensor_ids = table['sensor_id'].tolist()
+        gaps = time_diffs.tolist()
+        spans = []
+        i = 0
+        while i < len(sensor_ids):
+            j = i + 1
+            while j < len(sensor_ids) and j - i < batch_size and (not realtime or gaps[j] < BATCH_THRESHOLD):
+                j += 1
+            topic = topic_cache[sensor_ids[i]] if j - i == 1 else batch_topic
+            spans.append((i, j - i, [topic, raw[i * size:j * size]]))
+            i = j
+
+        def log_sent(count, topic):
+            if count == 1:
+                print(f"REPLAYER: Sent on topic '{topic.decode('utf-8')}'")
+            else:
+                print(f"REPLAYER: Sent {count} samples on topic '{topic.decode('utf-8')}'")
 
         print(f"REPLAYER: Starting data replay. Looping is {'ENABLED' if loop_data else 'DISABLED'}.")
-        
+        sent = 0
+        next_report = PROGRESS_INTERVAL
+        # Local references avoid attribute lookups in the loops below.
+        send = socket.send_multipart
+        sleep = time.sleep
+        now = time.perf_counter
+
         while True:
-            for i, row in df.iterrows():
-                topic = f"sensor/em/{int(row['sensor_id'])}"
-                message = pack_sensor_data(row)
-                socket.send_multipart([topic.encode('utf-8'), message])
-                print(f"REPLAYER: Sent on topic '{topic}'")
-                if i < len(time_diffs) and time_diffs[i] > 0:
-                    time.sleep(time_diffs[i])
-            
+            # Separate loops, so that max-rate replays carry no scheduling code.
+            if realtime:
+                send_at = (now() + offsets).tolist()
+                for i, count, frames in spans:
+                    delay = send_at[i] - now()
+                    if delay > 0:
+                        sleep(delay)
+                    send(frames)
+                    if verbose:
+                        log_sent(count, frames[0])
+                    sent += count
+                    if sent >= next_report:
+                        print(f"REPLAYER: Sent {sent} samples so far.")
+                        next_report += PROGRESS_INTERVAL
+            else:
+                for i, count, frames in spans:
+                    send(frames)
+                    if verbose:
+                        log_sent(count, frames[0])
+                    sent += count
+                    if sent >= next_report:
+                        print(f"REPLAYER: Sent {sent} samples so far.")
+                        next_report += PROGRESS_INTERVAL
+
             if not loop_data:
                 break
             
             print("REPLAYER: Replay loop restarting...")
             time.sleep(1)
 
-        print("REPLAYER: Replay finished.")
+        print(f"REPLAYER: Replay finished after sending {sent} samples.")
+        # Never drop the end-of-stream signal, even if a subscriber lags behind.
+        socket.setsockopt(zmq.XPUB_NODROP, 1)
         socket.send_multipart([b'control/done', b''])
         time.sleep(1)
 
@@ -85,49 +363,102 @@ def replay(rel_path, loop_data=False):
         print(f"REPLAYER: An error occurred: {e}")
     finally:
         socket.close()
-        context.term()
         print("REPLAYER: Server shut down.")
 
 
 # --- ZMQ Subscriber Function ---
 
-def consume(N):
+# Receive-side queue and kernel buffer sizes, sized for bursty replays.
+RCVHWM = 100000
+RCVBUF = 4 * 1024 * 1024
+
+async def consume_async(N, verbose=False, hwm=RCVHWM,
+                        transport=TRANSPORTS['tcp'][1], context=_CTX):
     """
     A ZMQ SUB client that subscribes to N sensor topics and a control topic.
-    Connects to port 5555.
+    Connects to transport (port 5555 by default), using the given context.
+    Prints every message if verbose, otherwise every PROGRESS_INTERVAL samples.
+    Up to hwm messages are queued before new ones are dropped.
     """
-    context = zmq.Context()
+    # An asyncio view of the same underlying context; it must not be terminated.
+    context = zmq.asyncio.Context.shadow(context.underlying)
     socket = context.socket(zmq.SUB)
-    socket.connect("tcp://localhost:5555")
+    socket.setsockopt(zmq.RCVHWM, hwm)
+    socket.setsockopt(zmq.RCVBUF, RCVBUF)
+    socket.connect(transport)
     print(f"CONSUMER: Subscribing to {N} sensor topics...")
 
-    for i in range(1, N + 1):
-        socket.setsockopt_string(zmq.SUBSCRIBE, f"sensor/em/{i}")
+    # A single prefix subscription per format covers every sensor and the batch
+    # topic; the sensors we are not interested in are filtered out below.
+    # Both maps give the payload dtype of each accepted topic.
+    sample_topics = {}
+    for prefix, dtype in ((SENSOR_TOPIC_PREFIX, SENSOR_DTYPE), (QUANTIZED_TOPIC_PREFIX, QUANTIZED_SENSOR_DTYPE)):
+        socket.setsockopt_string(zmq.SUBSCRIBE, prefix)
+        sample_topics.update({f"{prefix}{i}".encode('utf-8'): dtype for i in range(1, N + 1)})
+    batch_topics = {BATCH_TOPIC.encode('utf-8'): SENSOR_DTYPE,
+                    QUANTIZED_BATCH_TOPIC.encode('utf-8'): QUANTIZED_SENSOR_DTYPE}
     socket.setsockopt_string(zmq.SUBSCRIBE, 'control/done')
+    allowed_ids = np.arange(1, N + 1)
+
+    received = 0
+    next_report = PROGRESS_INTERVAL
 
     try:
         while True:
-            topic_bytes, message_bytes = socket.recv_multipart()
-            topic = topic_bytes.decode('utf-8')
-
-            if topic == 'control/done':
-                print("CONSUMER: Received done signal. Shutting down.")
+            if received >= next_report:
+                print(f"CONSUMER: Received {received} samples so far.")
+                next_report += PROGRESS_INTERVAL
+
+            # Frames expose the received payload as a buffer, so decoding
+            # below reads from it directly without an intermediate bytes copy.
+            topic_frame, message_frame = await socket.recv_multipart(copy=False)
+            topic_bytes = topic_frame.bytes
+
+            dtype = sample_topics.get(topic_bytes)
+            if dtype is not None:
+                received += 1
+                if verbose:
+                    samples = np.frombuffer(message_frame.buffer, dtype=dtype)
+                    if dtype is QUANTIZED_SENSOR_DTYPE:
+                        samples = dequantize_sensor_table(samples)
+                    print(format_sensor_data(topic_bytes.decode('utf-8'), samples[0]))
+                continue
+
+            dtype = batch_topics.get(topic_bytes)
+            if dtype is not None:
+                # Batches carry samples of every sensor; keep those we subscribed to.
+                samples = np.frombuffer(message_frame.buffer, dtype=dtype)
+                samples = samples[np.isin(samples['sensor_id'], allowed_ids)]
+                received += len(samples)
+                if verbose:
+                    if dtype is QUANTIZED_SENSOR_DTYPE:
+                        samples = dequantize_sensor_table(samples)
+                    topic = topic_bytes.decode('utf-8')
+                    for data in samples.tolist():
+                        print(format_sensor_data(topic, data))
+                continue
+
+            if topic_bytes == b'control/done':
+                print(f"CONSUMER: Received done signal after {received} samples. Shutting down.")
                 break
 
-            data = unpack_sensor_data(message_bytes)
-            output = (f"CONSUMER: Received on '{topic}': "
-                      f"ID={data[0]}, Time={data[1]}, "
-                      f"Pos=({data[2]:.2f}, {data[3]:.2f}, {data[4]:.2f}), "
-                      f"Quat=({data[5]:.2f}, {data[6]:.2f}, {data[7]:.2f}, {data[8]:.2f})")
-            print(output)
-
     except (KeyboardInterrupt, SystemExit):
         print("\nCONSUMER: Shutting down consumer...")
     finally:
         socket.close()
-        context.term()
         print("CONSUMER: Consumer shut down.")
 
+def consume(N, verbose=False, hwm=RCVHWM, transport=TRANSPORTS['tcp'][1], context=_CTX):
+    """
+    Runs consume_async on a fresh event loop, using uvloop when available.
+    Safe to call from a worker thread.
+    """
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(consume_async(N, verbose, hwm, transport, context))
+    finally:
+        loop.close()
+
 
 # --- CLI, Help, and File Explorer ---
 
@@ -144,7 +475,13 @@ def create_dummy_csv(file_path):
         writer = csv.writer(f)
         writer.writerow(header)
         writer.writerows(data)
-    print(f"INFO: Created dummy CSV '{file_path}' with float sensor IDs.")
+
+    # Also store the pre-parsed table, so that replays can skip the CSV parsing.
+    indices = [header.index(name) for name in CSV_COLUMNS]
+    table = np.array([tuple(row[i] for i in indices) for row in data], dtype=_CSV_DTYPE).astype(SENSOR_DTYPE)
+    npy_path = _cache_path(file_path)
+    np.save(npy_path, table)
+    print(f"INFO: Created dummy CSV '{file_path}' with float sensor IDs, cached as '{npy_path}'.")
 
 def print_help_message(console):
     """Displays the help panel in the CLI."""
@@ -164,6 +501,11 @@ This mode bypasses the interactive CLI for scripting or direct execution.
 * [bold cyan]-f, --file PATH[/]   (Required) Path to the input CSV file.
 * [bold cyan]-r, --loop[/]        (Optional) Loop the data replay indefinitely.
 * [bold cyan]-n, --sensors N[/]  (Optional) Number of sensor topics for the consumer to subscribe to. Defaults to 4.
+* [bold cyan]-b, --batch N[/]    (Optional) Coalesce up to N closely spaced samples per message. Defaults to 1.
+* [bold cyan]-v, --verbose[/]     (Optional) Print every message instead of periodic progress lines.
+* [bold cyan]-m, --max-rate[/]    (Optional) Send as fast as possible, ignoring the frame timing.
+* [bold cyan]-q, --quantize[/]    (Optional) Send poses as int16 on 'sensor/emq/' topics (mm and Q15 quaternions).
+* [bold cyan]-t, --transport T[/] (Optional) One of tcp, ipc or inproc. Defaults to tcp; the others are local only.
 
 [bold]Example:[/]
 [green]python em_util.py -f data/log.csv -r -n 3[/]
@@ -171,15 +513,25 @@ This mode bypasses the interactive CLI for scripting or direct execution.
     console.print(Panel.fit(help_text, title="[bold yellow]Help / Usage[/]", border_style="yellow"))
 
 
+# Row style and type label of file explorer entries, keyed by (is_dir, is_csv).
+_EXPLORER_STYLES = {
+    (True, False): "bold blue", (True, True): "bold green",
+    (False, False): "white", (False, True): "bold green",
+}
+_EXPLORER_TYPES = {True: "[dir]", False: "[file]"}
+
 def file_explorer(console, start_path='.'):
     """An interactive CLI file explorer to select a CSV file."""
     current_path = os.path.abspath(start_path)
 
     while True:
         try:
-            items = os.listdir(current_path)
-            dirs = sorted([d for d in items if os.path.isdir(os.path.join(current_path, d))])
-            files = sorted([f for f in items if os.path.isfile(os.path.join(current_path, f))])
+            # DirEntry caches the file type, avoiding a stat call per entry.
+            # Entries are (name, is_dir, is_csv), directories listed first.
+            with os.scandir(current_path) as it:
+                entries = [(e.name, e.is_dir(), e.name.endswith('.csv'))
+                           for e in it if e.is_dir() or e.is_file()]
+            entries.sort(key=lambda entry: (not entry[1], entry[0]))
 
             table = Table(title=f"Path: {current_path}", style="cyan", title_style="bold magenta")
             table.add_column("Index", style="dim", width=5)
@@ -191,14 +543,10 @@ def file_explorer(console, start_path='.'):
             table.add_row("g", "[opt]", "Generate dummy 'replay_data.csv'")
             table.add_row("q", "[opt]", "Quit")
 
-            display_items = [("..", "[dir]")] + [(d, "[dir]") for d in dirs] + [(f, "[file]") for f in files]
+            display_items = [("..", True, False)] + entries
 
-            for i, (name, item_type) in enumerate(display_items):
-                if i == 0: continue
-                style = "white";
-                if name.endswith('.csv'): style = "bold green"
-                elif item_type == "[dir]": style = "bold blue"
-                table.add_row(str(i), item_type, name, style=style)
+            for i, (name, is_dir, is_csv) in enumerate(entries, start=1):
+                table.add_row(str(i), _EXPLORER_TYPES[is_dir], name, style=_EXPLORER_STYLES[(is_dir, is_csv)])
 
             console.print(table)
             choice = console.input("Enter [bold yellow]Index[/] to select, or an [bold yellow]Option[/]: ").lower().strip()
@@ -214,12 +562,12 @@ def file_explorer(console, start_path='.'):
             if not (0 <= idx < len(display_items)):
                 console.print("[bold red]Index out of range.[/]\n"); continue
 
-            selected_name, selected_type = display_items[idx]
+            selected_name, is_dir, is_csv = display_items[idx]
             selected_path = os.path.join(current_path, selected_name)
 
-            if selected_type == "[dir]":
+            if is_dir:
                 current_path = os.path.abspath(selected_path)
-            elif selected_name.endswith('.csv'):
+            elif is_csv:
                 console.print(f"\n[bold green]Selected file: {selected_path}[/]")
                 return selected_path
             else:
@@ -252,8 +600,10 @@ def cli():
         except ValueError:
             console.print("[bold red]Invalid input. Please enter an integer.[/]")
 
-    publisher_thread = threading.Thread(target=replay, args=(csv_path, should_loop))
-    consumer_thread = threading.Thread(target=consume, args=(n_sensors,))
+    # The interactive mode is meant for watching the stream, so print every message.
+    # It keeps the TCP transport so that other processes can subscribe as well.
+    publisher_thread = threading.Thread(target=replay, args=(csv_path, should_loop), kwargs={'verbose': True})
+    consumer_thread = threading.Thread(target=consume, args=(n_sensors,), kwargs={'verbose': True})
 
     console.rule(f"[bold green]Starting replay of '{os.path.basename(csv_path)}'[/]")
     publisher_thread.start()
@@ -289,13 +639,46 @@ if __name__ == "__main__":
         default=4,
         help="Number of sensor topics to subscribe to in headless mode (default: 4)."
     )
+    parser.add_argument(
+        '-b', '--batch',
+        type=int,
+        default=1,
+        help="Maximum number of closely spaced samples to coalesce per message (default: 1)."
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help="Print every sent and received message in headless mode."
+    )
+    parser.add_argument(
+        '-m', '--max-rate',
+        action='store_true',
+        help="Send samples as fast as possible instead of following the frame timing."
+    )
+    parser.add_argument(
+        '-q', '--quantize',
+        action='store_true',
+        help="Send positions and quaternions as int16 on 'sensor/emq/' topics to save bandwidth."
+    )
+    parser.add_argument(
+        '-t', '--transport',
+        choices=list(TRANSPORTS),
+        default='tcp',
+        help="Transport between the replayer and the consumer (default: tcp).\n"
+             "'inproc' and 'ipc' are faster but not reachable from other hosts;\n"
+             "'inproc' is not reachable from other processes either."
+    )
     args = parser.parse_args()
 
     # If a file is provided via command line, run in headless mode.
     if args.file:
         print("--- Running in Headless Mode ---")
-        publisher_thread = threading.Thread(target=replay, args=(args.file, args.loop))
-        consumer_thread = threading.Thread(target=consume, args=(args.sensors,))
+        bind_endpoint, connect_endpoint = get_endpoints(args.transport)
+        publisher_thread = threading.Thread(target=replay, args=(args.file, args.loop, args.batch, args.verbose),
+                                            kwargs={'transport': bind_endpoint, 'quantize': args.quantize,
+                                                    'realtime': not args.max_rate})
+        consumer_thread = threading.Thread(target=consume, args=(args.sensors, args.verbose),
+                                           kwargs={'transport': connect_endpoint})
         
         publisher_thread.start()
         consumer_thread.start()
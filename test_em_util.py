@@ -0,0 +1,45 @@
+import pytest
+
+import em_util
+
+HEADER = 'SEU,FrErr,Frame,Sensor1,btn0_1,btn1_1,d1,aux(hex)_1,X1 (M),Y1,Z1,Qw1,Qx1,Qy1,Qz1\n'
+ROWS = [
+    '1.0,0,100,1,0,0,0,{aux},0.1,0.2,0.3,1.0,0.0,0.0,0.0\n',
+    '2.0,0,220,2,0,0,0,{aux},0.4,0.5,0.6,0.9,0.1,0.0,0.0\n',
+]
+
+
+@pytest.mark.parametrize('prefix, aux', [
+    ('', '0x0'),
+    ('', '#0'),
+    ('', '"a,b"'),
+    ('\ufeff', '0x0'),
+])
+def test_csv_parsers_agree(tmp_path, monkeypatch, prefix, aux):
+    """The NumPy (small file) and pandas parsers return identical tables."""
+    path = tmp_path / 'data.csv'
+    path.write_text(prefix + HEADER + ''.join(row.format(aux=aux) for row in ROWS), encoding='utf-8')
+
+    monkeypatch.setattr(em_util, 'SMALL_CSV_SIZE', 1024 * 1024)
+    small = em_util.load_sensor_table(str(path))
+    (tmp_path / 'data.npy').unlink()
+    monkeypatch.setattr(em_util, 'SMALL_CSV_SIZE', 0)
+    large = em_util.load_sensor_table(str(path))
+
+    assert small.dtype == em_util.SENSOR_DTYPE
+    assert len(small) == len(ROWS)
+    assert (small == large).all()
+
+
+def test_load_writes_and_reuses_cache(tmp_path):
+    """Parsing a CSV writes a '.npy' cache that is preferred while it is current."""
+    path = tmp_path / 'data.csv'
+    path.write_text(HEADER + ''.join(row.format(aux='0x0') for row in ROWS))
+
+    table = em_util.load_sensor_table(str(path))
+    cache = tmp_path / 'data.npy'
+    assert cache.exists()
+    assert (em_util.load_sensor_table(str(path)) == table).all()
+
+    cache.write_bytes(cache.read_bytes()[:-5])
+    assert (em_util.load_sensor_table(str(path)) == table).all()